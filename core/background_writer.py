@@ -0,0 +1,67 @@
+"""
+KVGroove Background Writer
+Coalesces rapid saves into one write on a background thread
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+
+def write_json_atomic(path: Path, data: Any):
+    """Write JSON beside path and swap it in, so a failed write never truncates it"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class BackgroundWriter:
+    """Writes the latest snapshot once save requests pause for `delay` seconds"""
+    
+    def __init__(self, write: Callable[[Any], None], delay: float):
+        self._write = write
+        self._delay = delay
+        self._event = threading.Event()
+        self._pending_lock = threading.Lock()  # Guards _pending
+        # Held from taking a snapshot until it is on disk, so an older
+        # snapshot can never be written after a newer one
+        self._write_lock = threading.Lock()
+        self._pending: Optional[Any] = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def schedule(self, snapshot: Any):
+        """Write snapshot on the background thread once requests settle"""
+        with self._pending_lock:
+            self._pending = snapshot
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, daemon=True)
+            self._thread.start()
+        self._event.set()
+    
+    def write_now(self, snapshot: Any):
+        """Write snapshot immediately, replacing any pending background write"""
+        with self._write_lock:
+            with self._pending_lock:
+                self._pending = None
+            self._write(snapshot)
+    
+    def flush(self):
+        """Write any pending snapshot now, waiting for a write already in progress"""
+        with self._write_lock:
+            with self._pending_lock:
+                snapshot, self._pending = self._pending, None
+            if snapshot is not None:
+                self._write(snapshot)
+    
+    def _worker(self):
+        """Flush pending snapshots once requests stop arriving"""
+        while True:
+            self._event.wait()
+            self._event.clear()
+            while self._event.wait(self._delay):
+                self._event.clear()
+            self.flush()
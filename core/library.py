@@ -6,12 +6,14 @@ Handles music library indexing and metadata
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from mutagen import File
 from mutagen.easyid3 import EasyID3
 from mutagen.mp3 import MP3
 from mutagen.flac import FLAC
+from .background_writer import BackgroundWriter, write_json_atomic
 
 
 SUPPORTED_FORMATS = {'.mp3', '.flac', '.wav', '.ogg', '.m4a', '.wma'}
@@ -26,6 +28,13 @@ class Track:
     album: str
     duration: float  # seconds
     
+    @cached_property
+    def duration_str(self) -> str:
+        """Duration formatted as mm:ss"""
+        minutes = int(self.duration // 60)
+        secs = int(self.duration % 60)
+        return f"{minutes}:{secs:02d}"
+    
     def to_dict(self) -> dict:
         return asdict(self)
     
@@ -49,6 +58,15 @@ class Library:
         self.data_path = Path(data_path)
         self.folders: List[str] = []
         self.tracks: List[Track] = []
+        # Bumped on every change, so views can tell when cached rows are stale
+        self.version: int = 0
+        self._path_map: Dict[str, Track] = {}
+        self._path_index: Dict[str, int] = {}  # path -> position in tracks
+        self._path_map_version = -1
+        
+        # Background saving, coalesced until edits pause for 2 seconds
+        self._writer = BackgroundWriter(self._write, 2.0)
+        
         self._load()
     
     def _load(self):
@@ -64,19 +82,38 @@ class Library:
             self.folders = []
             self.tracks = []
     
-    def _save(self):
-        """Save library to JSON file"""
+    def _snapshot(self) -> Tuple[List[str], List[Track]]:
+        """Get copies of the folder and track lists to write from another thread"""
+        return (list(self.folders), list(self.tracks))
+    
+    def _write(self, data: Tuple[List[str], List[Track]]):
+        """Write library data to the JSON file"""
+        folders, tracks = data
         try:
-            self.data_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                data = {
-                    'folders': self.folders,
-                    'tracks': [t.to_dict() for t in self.tracks]
-                }
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.data_path, {
+                'folders': folders,
+                'tracks': [t.to_dict() for t in tracks]
+            })
         except Exception as e:
             print(f"Error saving library: {e}")
     
+    def _save(self):
+        """Save library to JSON file"""
+        # Every mutation ends in a save
+        self.version += 1
+        
+        # Waits for any background write, then replaces its pending snapshot
+        self._writer.write_now(self._snapshot())
+    
+    def mark_dirty(self):
+        """Save the library on a background thread once edits pause for 2 seconds"""
+        self.version += 1
+        self._writer.schedule(self._snapshot())
+    
+    def flush(self):
+        """Write any pending background save now and wait for it to finish"""
+        self._writer.flush()
+    
     def add_folder(self, folder_path: str) -> int:
         """Add a folder to the library and scan for tracks. Returns number of tracks added."""
         folder = str(Path(folder_path).resolve())
@@ -190,17 +227,44 @@ class Library:
                query in t.album.lower()
         ]
     
+    def _get_path_map(self) -> Dict[str, Track]:
+        """Get the path -> track map, rebuilt after the library changes"""
+        if self._path_map_version != self.version:
+            self._path_map = {t.path: t for t in self.tracks}
+            self._path_index = {t.path: i for i, t in enumerate(self.tracks)}
+            self._path_map_version = self.version
+        return self._path_map
+    
+    def update_track(self, track: Track) -> bool:
+        """Replace the library entry with the same path as track and schedule a save"""
+        self._get_path_map()
+        idx = self._path_index.get(track.path)
+        if idx is None:
+            return False
+        self.tracks[idx] = track
+        self._path_map[track.path] = track
+        self.mark_dirty()
+        # The path and position are unchanged, so the maps are still current
+        self._path_map_version = self.version
+        return True
+    
     def get_track_by_path(self, path: str) -> Optional[Track]:
         """Get a track by its file path"""
-        for track in self.tracks:
-            if track.path == path:
-                return track
-        return None
-    
-    def get_tracks_by_paths(self, paths: List[str]) -> List[Track]:
-        """Get multiple tracks by their file paths"""
-        path_set = set(paths)
-        return [t for t in self.tracks if t.path in path_set]
+        return self._get_path_map().get(path)
+    
+    def get_tracks_by_paths(self, paths: List[str]) -> List[Optional[Track]]:
+        """Get tracks for several paths in one call (None where not in the library)"""
+        return list(map(self._get_path_map().get, paths))
+    
+    def read_tracks(self, paths: List[str]) -> Dict[str, Track]:
+        """Read tags for files outside the library, without adding them. Safe to call off the UI thread."""
+        tracks = {}
+        for path in paths:
+            if Path(path).is_file():
+                track = self._extract_metadata(path)
+                if track:
+                    tracks[path] = track
+        return tracks
     
     def get_tracks_by_folder(self, folder_path: str) -> List[Track]:
         """Get all tracks in a specific folder"""
@@ -7,6 +7,7 @@ import json
 from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass, field
+from .background_writer import BackgroundWriter, write_json_atomic
 from .library import Track
 
 
@@ -15,11 +16,12 @@ class Playlist:
     """Represents a playlist"""
     name: str
     tracks: List[str] = field(default_factory=list)  # List of file paths
+    revision: int = field(default=0, compare=False, repr=False)  # Bumped on every change
     
     def to_dict(self) -> dict:
         return {
             'name': self.name,
-            'tracks': self.tracks
+            'tracks': list(self.tracks)
         }
     
     @classmethod
@@ -33,21 +35,31 @@ class Playlist:
         """Add a track to the playlist"""
         if track_path not in self.tracks:
             self.tracks.append(track_path)
+            self.revision += 1
     
     def remove_track(self, track_path: str):
         """Remove a track from the playlist"""
         if track_path in self.tracks:
             self.tracks.remove(track_path)
+            self.revision += 1
+    
+    def remove_at(self, index: int):
+        """Remove the track at a position in the playlist"""
+        if 0 <= index < len(self.tracks):
+            del self.tracks[index]
+            self.revision += 1
     
     def move_track(self, from_index: int, to_index: int):
         """Move a track within the playlist"""
         if 0 <= from_index < len(self.tracks) and 0 <= to_index < len(self.tracks):
             track = self.tracks.pop(from_index)
             self.tracks.insert(to_index, track)
+            self.revision += 1
     
     def clear(self):
         """Clear all tracks from the playlist"""
         self.tracks = []
+        self.revision += 1
 
 
 class PlaylistManager:
@@ -56,6 +68,12 @@ class PlaylistManager:
     def __init__(self, data_path: str = "data/playlists.json"):
         self.data_path = Path(data_path)
         self.playlists: List[Playlist] = []
+        # Bumped on every save, so views can skip refreshing unchanged lists
+        self.revision: int = 0
+        
+        # Background saving, coalesced until changes settle for 100 ms
+        self._writer = BackgroundWriter(self._write, 0.1)
+        
         self._load()
     
     def _load(self):
@@ -69,18 +87,34 @@ class PlaylistManager:
             print(f"Error loading playlists: {e}")
             self.playlists = []
     
-    def _save(self):
-        """Save playlists to JSON file"""
+    def _snapshot(self) -> dict:
+        """Get a copy of the playlist data that is safe to write from another thread"""
+        return {
+            'playlists': [p.to_dict() for p in self.playlists]
+        }
+    
+    def _write(self, data: dict):
+        """Write playlist data to the JSON file"""
         try:
-            self.data_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                data = {
-                    'playlists': [p.to_dict() for p in self.playlists]
-                }
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.data_path, data)
         except Exception as e:
             print(f"Error saving playlists: {e}")
     
+    def _save(self):
+        """Save playlists to JSON file"""
+        self.revision += 1
+        # Waits for any background write, then replaces its pending snapshot
+        self._writer.write_now(self._snapshot())
+    
+    def save_async(self):
+        """Save playlists on a background thread, coalescing rapid calls"""
+        self.revision += 1
+        self._writer.schedule(self._snapshot())
+    
+    def flush(self):
+        """Write any pending background save now and wait for it to finish"""
+        self._writer.flush()
+    
     def create_playlist(self, name: str) -> Playlist:
         """Create a new playlist"""
         # Ensure unique name
@@ -113,6 +147,7 @@ class PlaylistManager:
         for playlist in self.playlists:
             if playlist.name == old_name:
                 playlist.name = new_name
+                playlist.revision += 1
                 self._save()
                 return True
         return False
@@ -204,6 +239,7 @@ class PlaylistManager:
             
             playlist = self.create_playlist(playlist_name)
             playlist.tracks = tracks
+            playlist.revision += 1
             self._save()
             return playlist
         except Exception as e:
@@ -230,6 +266,7 @@ class PlaylistManager:
             
             playlist = self.create_playlist(playlist_name)
             playlist.tracks = tracks
+            playlist.revision += 1
             self._save()
             return playlist
         except Exception as e:
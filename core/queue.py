@@ -18,10 +18,13 @@ class PlayQueue:
         self._shuffle: bool = False
         self._repeat: str = "none"  # "none", "one", "all"
         self._original_queue: List[str] = []  # For unshuffle
+        # Bumped whenever the queue's contents change, so views can skip no-op refreshes
+        self.version: int = 0
     
     def add(self, track_path: str):
         """Add a track to the end of the queue"""
         self._queue.append(track_path)
+        self.version += 1
         if not self._shuffle:
             self._original_queue.append(track_path)
     
@@ -29,12 +32,14 @@ class PlayQueue:
         """Add a track to play next (after current)"""
         insert_pos = self._current_index + 1 if self._current_index >= 0 else 0
         self._queue.insert(insert_pos, track_path)
+        self.version += 1
         if not self._shuffle:
             self._original_queue.insert(insert_pos, track_path)
     
     def add_multiple(self, track_paths: List[str]):
         """Add multiple tracks to the queue"""
         self._queue.extend(track_paths)
+        self.version += 1
         if not self._shuffle:
             self._original_queue.extend(track_paths)
     
@@ -42,6 +47,7 @@ class PlayQueue:
         """Remove a track from the queue by index"""
         if 0 <= index < len(self._queue):
             track = self._queue.pop(index)
+            self.version += 1
             if index < self._current_index:
                 self._current_index -= 1
             elif index == self._current_index:
@@ -49,10 +55,30 @@ class PlayQueue:
             return track
         return None
     
+    def remove_many(self, indices: List[int]) -> List[str]:
+        """Remove several tracks in one pass, same as removing each in turn"""
+        to_remove = {i for i in indices if 0 <= i < len(self._queue)}
+        if not to_remove:
+            return []
+        
+        removed = [t for i, t in enumerate(self._queue) if i in to_remove]
+        self._queue = [t for i, t in enumerate(self._queue) if i not in to_remove]
+        self.version += 1
+        
+        if self._current_index >= 0:
+            before = sum(1 for i in to_remove if i < self._current_index)
+            if self._current_index in to_remove:
+                # The next remaining track becomes current, or the last one
+                self._current_index = min(self._current_index,
+                                          len(self._queue) + before - 1)
+            self._current_index -= before
+        return removed
+    
     def clear(self):
         """Clear the entire queue"""
         self._queue = []
         self._original_queue = []
+        self.version += 1
         self._current_index = -1
         self._history = []
     
@@ -129,6 +155,7 @@ class PlayQueue:
                 self._current_index = self._queue.index(current)
         
         self._shuffle = enabled
+        self.version += 1
     
     def is_shuffle(self) -> bool:
         """Check if shuffle is enabled"""
@@ -153,11 +180,16 @@ class PlayQueue:
             return self._queue[self._current_index + 1:]
         return self._queue.copy()
     
+    def upcoming_count(self) -> int:
+        """Get the number of tracks after current position"""
+        return max(0, len(self._queue) - self._current_index - 1)
+    
     def move_track(self, from_index: int, to_index: int):
         """Move a track within the queue"""
         if 0 <= from_index < len(self._queue) and 0 <= to_index < len(self._queue):
             track = self._queue.pop(from_index)
             self._queue.insert(to_index, track)
+            self.version += 1
             
             # Adjust current index if needed
             if from_index == self._current_index:
@@ -180,11 +212,13 @@ class PlayQueue:
             remaining = self._queue[self._current_index + 1:]
             random.shuffle(remaining)
             self._queue = self._queue[:self._current_index + 1] + remaining
+            self.version += 1
     
     def clear_upcoming(self):
         """Clear only upcoming tracks, keep current and history"""
         if self._current_index >= 0:
             self._queue = self._queue[:self._current_index + 1]
+            self.version += 1
     
     def to_list(self) -> List[str]:
         """Get queue as a simple list of paths"""
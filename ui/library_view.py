@@ -5,7 +5,7 @@ Panel for browsing and managing the music library
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Dict
 from core.library import Library, Track
 from core.settings import SettingsManager
 from ui.track_editor import TrackEditorDialog
@@ -29,6 +29,7 @@ class LibraryView(ttk.Frame):
         self.get_playlists = get_playlists
         self.settings = settings
         self.displayed_tracks: List[Track] = []
+        self._iid_to_idx: Dict[str, int] = {}  # Row -> index into displayed_tracks
         self.current_view = "all"  # "all", "favorites", "recent", "folder"
         self.current_folder = None
         
@@ -127,11 +128,11 @@ class LibraryView(ttk.Frame):
         self.tree.column('duration', width=60, minwidth=50)
         
         # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self._scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._scrollbar.set)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Bindings
         self.tree.bind('<Double-1>', self._on_double_click)
@@ -160,12 +161,6 @@ class LibraryView(ttk.Frame):
                                  font=('Segoe UI', 9))
         status_label.pack(fill=tk.X, padx=5, pady=(0, 5))
     
-    def _format_duration(self, seconds: float) -> str:
-        """Format duration in mm:ss"""
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes}:{secs:02d}"
-    
     def _on_view_change(self):
         """Handle view mode change"""
         view = self.view_var.get()
@@ -209,28 +204,38 @@ class LibraryView(ttk.Frame):
             
             if view == "favorites" and self.settings:
                 fav_paths = self.settings.get_favorites()
-                tracks = self.library.get_tracks_by_paths(fav_paths)
+                tracks = [t for t in self.library.get_tracks_by_paths(fav_paths) if t]
             elif view == "recent" and self.settings:
                 recent_paths = self.settings.get_recently_played()
-                tracks = self.library.get_tracks_by_paths(recent_paths)
+                tracks = [t for t in self.library.get_tracks_by_paths(recent_paths) if t]
             elif view == "folder" and self.current_folder:
                 tracks = self.library.get_tracks_by_folder(self.current_folder)
             else:
                 tracks = self.library.get_all_tracks()
         
         self.displayed_tracks = tracks
-        
-        for track in tracks:
-            is_fav = self.settings.is_favorite(track.path) if self.settings else False
-            fav_icon = "★" if is_fav else ""
-            self.tree.insert('', tk.END, values=(
-                fav_icon,
-                track.title,
-                track.artist,
-                track.album,
-                self._format_duration(track.duration)
-            ))
-        
+        self._iid_to_idx = {}
+        
+        # Hide the columns and unhook the scrollbar while inserting,
+        # so the tree lays out once instead of after every row
+        display_columns = self.tree['displaycolumns']
+        self.tree.configure(displaycolumns=(), yscrollcommand='')
+        
+        try:
+            for i, track in enumerate(tracks):
+                is_fav = self.settings.is_favorite(track.path) if self.settings else False
+                fav_icon = "★" if is_fav else ""
+                item = self.tree.insert('', tk.END, values=(
+                    fav_icon,
+                    track.title,
+                    track.artist,
+                    track.album,
+                    track.duration_str
+                ))
+                self._iid_to_idx[item] = i
+        finally:
+            self.tree.configure(displaycolumns=display_columns,
+                                yscrollcommand=self._scrollbar.set)
         self.status_var.set(f"{len(tracks)} tracks")
     
     def _toggle_favorite(self):
@@ -339,7 +344,7 @@ class LibraryView(ttk.Frame):
         """Get currently selected tracks"""
         selected = []
         for item in self.tree.selection():
-            idx = self.tree.index(item)
+            idx = self._iid_to_idx.get(item, -1)
             if 0 <= idx < len(self.displayed_tracks):
                 selected.append(self.displayed_tracks[idx])
         return selected
@@ -390,8 +395,8 @@ class LibraryView(ttk.Frame):
         if tracks:
             # Get the parent window (main window root)
             parent = self.winfo_toplevel()
-            TrackEditorDialog(parent, tracks[0], self.library, 
-                            on_save=lambda t: self._refresh_list())
+            TrackEditorDialog.show(parent, tracks[0], self.library,
+                                   on_save=lambda t: self._refresh_list())
     
     def refresh(self):
         """Public method to refresh the view"""
@@ -4,6 +4,7 @@ Main application window layout and controls
 """
 
 import tkinter as tk
+from os.path import basename
 from tkinter import ttk, filedialog, messagebox, simpledialog
 from typing import Optional
 import json
@@ -25,6 +26,10 @@ from ui.themes import apply_theme, get_theme_list, THEMES
 class MainWindow:
     """Main application window"""
     
+    # Repeat mode transitions and button symbols
+    _REPEAT_NEXT = {'none': 'all', 'all': 'one', 'one': 'none'}
+    _REPEAT_SYM = {'none': "↩", 'all': "🔁", 'one': "🔂"}
+    
     def __init__(self):
         self.root = tk.Tk()
         self.root.title("KVGroove")
@@ -52,6 +57,8 @@ class MainWindow:
         
         # Current track info
         self.current_track: Optional[Track] = None
+        self._current_duration_s: float = 0.0
+        self._inv_duration_s: float = 0.0
         self.is_muted: bool = False
         self.pre_mute_volume: float = 0.7
         
@@ -291,12 +298,12 @@ class MainWindow:
     def _clear_upcoming(self):
         """Clear upcoming tracks in queue"""
         self.queue.clear_upcoming()
-        self.queue_view.refresh()
+        self.queue_view.remove_rows_from(len(self.queue))
     
     def _clear_queue(self):
         """Clear entire queue"""
         self.queue.clear()
-        self.queue_view.refresh()
+        self.queue_view.set_rows([])
     
     def _save_queue_as_playlist(self):
         """Save current queue as a playlist"""
@@ -512,24 +519,20 @@ class MainWindow:
     
     def _get_repeat_symbol(self) -> str:
         """Get symbol for current repeat mode"""
-        mode = self.queue.get_repeat()
-        if mode == 'one':
-            return "🔂"
-        elif mode == 'all':
-            return "🔁"
-        return "↩"
+        return self._REPEAT_SYM[self.queue.get_repeat()]
     
     def _play_track(self, track: Track):
         """Play a specific track"""
         # Add to queue and play
         self.queue.add(track.path)
+        self.queue_view.append_row(track)
         self.queue.play_index(len(self.queue) - 1)
         self._load_and_play_current()
     
     def _add_to_queue(self, track: Track):
         """Add track to queue"""
         self.queue.add(track.path)
-        self.queue_view.refresh()
+        self.queue_view.append_row(track)
     
     def _add_to_playlist(self, track: Track, playlist_name: str):
         """Add track to a playlist"""
@@ -540,6 +543,7 @@ class MainWindow:
         self.queue.clear()
         self.queue.add_multiple(track_paths)
         self.queue.play_index(0)
+        self.queue_view.refresh()
         self._load_and_play_current()
     
     def _play_queue_index(self, index: int):
@@ -556,6 +560,10 @@ class MainWindow:
         self.current_track = self.library.get_track_by_path(track_path)
         
         if self.player.load(track_path):
+            # Duration is fixed for the track, so cache it for the position loop
+            self._current_duration_s = self.player.get_duration()
+            self._inv_duration_s = (1.0 / self._current_duration_s
+                                    if self._current_duration_s > 0 else 0.0)
             self.player.play()
             self.play_btn_text.set("⏸")
             
@@ -566,14 +574,14 @@ class MainWindow:
             if self.current_track:
                 self.title_var.set(self.current_track.title)
                 self.artist_var.set(self.current_track.artist)
-                self.duration_var.set(self._format_time(self.current_track.duration))
+                self.duration_var.set(self.current_track.duration_str)
             else:
-                filename = track_path.split('\\')[-1].split('/')[-1]
+                filename = basename(track_path.replace('\\', '/'))
                 self.title_var.set(filename)
                 self.artist_var.set("")
-                self.duration_var.set(self._format_time(self.player.get_duration()))
+                self.duration_var.set(self._format_time(self._current_duration_s))
             
-            self.queue_view.refresh()
+            self.queue_view.mark_now_playing(self.queue.get_current_index())
             self.queue_view.set_now_playing(self.current_track)
     
     def _toggle_play(self):
@@ -592,7 +600,7 @@ class MainWindow:
         self.player.stop()
         self.play_btn_text.set("▶")
         self.progress_var.set(0)
-        self.position_var.set("0:00")
+        self._set_if_changed(self.position_var, "0:00")
     
     def _previous_track(self):
         """Go to previous track"""
@@ -622,31 +630,22 @@ class MainWindow:
     
     def _toggle_repeat(self):
         """Cycle through repeat modes"""
-        current = self.queue.get_repeat()
-        if current == 'none':
-            self.queue.set_repeat('all')
-        elif current == 'all':
-            self.queue.set_repeat('one')
-        else:
-            self.queue.set_repeat('none')
-        
-        self.repeat_var.set(self._get_repeat_symbol())
+        mode = self._REPEAT_NEXT[self.queue.get_repeat()]
+        self.queue.set_repeat(mode)
+        self.repeat_var.set(self._REPEAT_SYM[mode])
     
     def _on_seek(self, value):
         """Handle seek bar change"""
-        if self.player.current_file:
-            duration = self.player.get_duration()
-            if duration > 0:
-                position = (float(value) / 100) * duration
-                self.player.seek(position)
+        if self.player.current_file and self._current_duration_s > 0:
+            position = (float(value) / 100) * self._current_duration_s
+            self.player.seek(position)
     
     def _seek_relative(self, seconds: int):
         """Seek relative to current position"""
         if self.player.current_file:
             new_pos = max(0, self.player.get_position() + seconds)
-            duration = self.player.get_duration()
-            if duration > 0:
-                self.progress_var.set((new_pos / duration) * 100)
+            if self._current_duration_s > 0:
+                self.progress_var.set(new_pos * self._inv_duration_s * 100.0)
                 self.player.seek(new_pos)
     
     def _on_volume_change(self, value):
@@ -659,17 +658,20 @@ class MainWindow:
         self.volume_var.set(new_vol)
         self.player.set_volume(new_vol / 100)
     
+    @staticmethod
+    def _set_if_changed(var: tk.StringVar, value: str):
+        """Set a label variable only if its text changes, sparing the trace and redraw"""
+        if var.get() != value:
+            var.set(value)
+    
     def _update_position(self):
         """Update position display periodically"""
         if self.player.is_playing:
             position = self.player.get_position()
-            duration = self.player.get_duration()
-            
-            self.position_var.set(self._format_time(position))
             
-            if duration > 0:
-                progress = (position / duration) * 100
-                self.progress_var.set(progress)
+            # The text only changes once a second, but this runs ten times a second
+            self._set_if_changed(self.position_var, self._format_time(position))
+            self.progress_var.set(position * self._inv_duration_s * 100.0)
         
         # Schedule next update
         self.root.after(100, self._update_position)
@@ -677,6 +679,8 @@ class MainWindow:
     def _on_close(self):
         """Handle window close"""
         self._save_settings()
+        self.playlist_manager.flush()
+        self.library.flush()
         self.player.cleanup()
         self.root.destroy()
     
@@ -4,15 +4,20 @@ Panel for managing playlists
 """
 
 import tkinter as tk
+from os.path import basename
 from tkinter import ttk, simpledialog, messagebox
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Dict, Tuple
 from core.playlist import PlaylistManager, Playlist
 from core.library import Library, Track
+from ui.virtual_list import VirtualListbox, VirtualTrackList
 
 
 class PlaylistView(ttk.Frame):
     """Playlist management panel"""
     
+    # Above this many playlists the sidebar uses a canvas-backed list
+    _VIRTUAL_LIST_THRESHOLD = 500
+    
     def __init__(self, parent, playlist_manager: PlaylistManager, library: Library,
                  on_track_double_click: Callable[[Track], None],
                  on_play_playlist: Callable[[List[str]], None]):
@@ -23,6 +28,14 @@ class PlaylistView(ttk.Frame):
         self.on_track_double_click = on_track_double_click
         self.on_play_playlist = on_play_playlist
         self.current_playlist: Optional[Playlist] = None
+        self._track_cache: Dict[str, Tuple[str, str, str]] = {}  # path -> row values
+        self._cache_version = -1
+        self._refresh_pending = False
+        self._tracks_dirty = False
+        self._playlist_display_cache: List[str] = []  # Rendered Listbox lines
+        self._playlists_cache: Optional[List[Playlist]] = None
+        self._pm_revision = -1  # Manager revision the sidebar was built from
+        self._last_rev: Optional[Tuple[Playlist, int, int]] = None  # Playlist, its revision, library version
         
         self._create_widgets()
         self._refresh_playlist_list()
@@ -52,8 +65,11 @@ class PlaylistView(ttk.Frame):
         list_container = ttk.Frame(left_frame)
         list_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        self.playlist_listbox = tk.Listbox(list_container, selectmode=tk.SINGLE,
-                                           font=('Segoe UI', 10))
+        if len(self._get_playlists()) > self._VIRTUAL_LIST_THRESHOLD:
+            self.playlist_listbox = VirtualListbox(list_container, font=('Segoe UI', 10))
+        else:
+            self.playlist_listbox = tk.Listbox(list_container, selectmode=tk.SINGLE,
+                                               font=('Segoe UI', 10))
         playlist_scroll = ttk.Scrollbar(list_container, orient=tk.VERTICAL,
                                         command=self.playlist_listbox.yview)
         self.playlist_listbox.configure(yscrollcommand=playlist_scroll.set)
@@ -74,6 +90,14 @@ class PlaylistView(ttk.Frame):
         self.playlist_context_menu.add_command(label="Delete", 
                                                command=self._delete_playlist)
         
+        # Posted without tk_popup's local grab loop, so dismiss it explicitly:
+        # on focus loss, Escape, or a click anywhere in the window
+        self._playlist_menu_posted = False
+        self._playlist_menu_serial = None  # Serial of the click that posted it
+        for sequence in ('<FocusOut>', '<Escape>'):
+            self.playlist_context_menu.bind(sequence, self._unpost_playlist_context_menu)
+        self.winfo_toplevel().bind('<Button>', self._on_window_click, add='+')
+        
         # Right panel: Playlist tracks
         right_frame = ttk.Frame(paned)
         paned.add(right_frame, weight=3)
@@ -94,28 +118,17 @@ class PlaylistView(ttk.Frame):
         track_container = ttk.Frame(right_frame)
         track_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        columns = ('title', 'artist', 'duration')
-        self.track_tree = ttk.Treeview(track_container, columns=columns, 
-                                        show='headings', selectmode='extended')
-        
-        self.track_tree.heading('title', text='Title')
-        self.track_tree.heading('artist', text='Artist')
-        self.track_tree.heading('duration', text='Duration')
-        
-        self.track_tree.column('title', width=200, minwidth=100)
-        self.track_tree.column('artist', width=150, minwidth=80)
-        self.track_tree.column('duration', width=60, minwidth=50)
+        # Rows are drawn on a canvas, so long playlists stay cheap
+        self.track_list = VirtualTrackList(track_container, columns=(
+            ('Title', 200),
+            ('Artist', 150),
+            ('Duration', 60),
+        ))
+        self.track_list.pack(fill=tk.BOTH, expand=True)
         
-        track_scroll = ttk.Scrollbar(track_container, orient=tk.VERTICAL,
-                                     command=self.track_tree.yview)
-        self.track_tree.configure(yscrollcommand=track_scroll.set)
-        
-        self.track_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        track_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.track_tree.bind('<Double-1>', self._on_track_double_click)
-        self.track_tree.bind('<Button-3>', self._show_track_context_menu)
-        self.track_tree.bind('<Delete>', lambda e: self._remove_selected_tracks())
+        self.track_list.bind('<Double-1>', self._on_track_double_click)
+        self.track_list.bind('<Button-3>', self._show_track_context_menu)
+        self.track_list.bind('<Delete>', lambda e: self._remove_selected_tracks())
         
         # Track context menu
         self.track_context_menu = tk.Menu(self, tearoff=0)
@@ -131,49 +144,83 @@ class PlaylistView(ttk.Frame):
                                  font=('Segoe UI', 9))
         status_label.pack(fill=tk.X, padx=5, pady=(0, 5))
     
-    def _format_duration(self, seconds: float) -> str:
-        """Format duration in mm:ss"""
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes}:{secs:02d}"
+    def _get_playlists(self) -> List[Playlist]:
+        """Get all playlists, cached until the next change"""
+        if self._playlists_cache is None:
+            self._playlists_cache = self.playlist_manager.get_all_playlists()
+        return self._playlists_cache
     
     def _refresh_playlist_list(self):
         """Refresh the playlist list"""
-        self.playlist_listbox.delete(0, tk.END)
-        for playlist in self.playlist_manager.get_all_playlists():
-            self.playlist_listbox.insert(tk.END, f"  {playlist.name}  ({len(playlist.tracks)})")
+        self._playlists_cache = None
+        self._pm_revision = self.playlist_manager.revision
+        lines = [f"  {p.name}  ({len(p.tracks)})" for p in self._get_playlists()]
+        old = self._playlist_display_cache
+        if lines == old:
+            return
+        
+        if len(lines) == len(old):
+            # Same playlists, e.g. a track count changed: replace changed rows only
+            selected = set(self.playlist_listbox.curselection())
+            for i, (new_line, old_line) in enumerate(zip(lines, old)):
+                if new_line != old_line:
+                    self.playlist_listbox.delete(i)
+                    self.playlist_listbox.insert(i, new_line)
+                    if i in selected:
+                        self.playlist_listbox.selection_set(i)
+        else:
+            # Rebuild from the first row that differs
+            first = next((i for i, (a, b) in enumerate(zip(lines, old)) if a != b),
+                         min(len(lines), len(old)))
+            self.playlist_listbox.delete(first, tk.END)
+            self.playlist_listbox.insert(tk.END, *lines[first:])
+        
+        self._playlist_display_cache = lines
     
     def _refresh_track_list(self):
         """Refresh the track list for current playlist"""
-        self.track_tree.delete(*self.track_tree.get_children())
-        
         if not self.current_playlist:
+            self._last_rev = None
+            self.track_list.set_rows([])
             self.status_var.set("")
             return
         
-        for track_path in self.current_playlist.tracks:
-            track = self.library.get_track_by_path(track_path)
+        # Stay at the same scroll position when redrawing the same playlist
+        same_playlist = bool(self._last_rev) and self._last_rev[0] is self.current_playlist
+        self._last_rev = (self.current_playlist, self.current_playlist.revision,
+                          self.library.version)
+        self.track_list.set_rows(self._track_rows(self.current_playlist.tracks),
+                                 keep_position=same_playlist)
+        self.status_var.set(f"{len(self.current_playlist.tracks)} tracks")
+    
+    def _track_rows(self, paths: List[str]) -> List[Tuple[str, str, str]]:
+        """Get the (title, artist, duration) row for each track path"""
+        # Row values stay valid until the library changes
+        if self._cache_version != self.library.version:
+            self._track_cache = {}
+            self._cache_version = self.library.version
+        cache = self._track_cache
+        
+        # Look up all uncached tracks in one call
+        missing = [p for p in paths if p not in cache]
+        for track_path, track in zip(missing, self.library.get_tracks_by_paths(missing)):
             if track:
-                self.track_tree.insert('', tk.END, values=(
-                    track.title,
-                    track.artist,
-                    self._format_duration(track.duration)
-                ))
+                cache[track_path] = (track.title, track.artist, track.duration_str)
             else:
                 # Track not in library anymore
-                self.track_tree.insert('', tk.END, values=(
-                    track_path.split('\\')[-1].split('/')[-1],
+                cache[track_path] = (
+                    basename(track_path.replace('\\', '/')),
                     "Unknown",
                     "--:--"
-                ))
+                )
         
-        self.status_var.set(f"{len(self.current_playlist.tracks)} tracks")
+        return [cache[p] for p in paths]
     
     def _on_playlist_select(self, event=None):
         """Handle playlist selection"""
         selection = self.playlist_listbox.curselection()
         if selection:
-            playlists = self.playlist_manager.get_all_playlists()
+            playlists = self._get_playlists()
             if 0 <= selection[0] < len(playlists):
                 self.current_playlist = playlists[selection[0]]
                 self.playlist_name_var.set(self.current_playlist.name)
@@ -185,6 +232,7 @@ class PlaylistView(ttk.Frame):
                                       parent=self)
         if name:
             self.playlist_manager.create_playlist(name)
+            self._playlists_cache = None
             self._refresh_playlist_list()
     
     def _rename_playlist(self):
@@ -198,6 +246,7 @@ class PlaylistView(ttk.Frame):
                                           parent=self)
         if new_name and new_name != self.current_playlist.name:
             if self.playlist_manager.rename_playlist(self.current_playlist.name, new_name):
+                self._playlists_cache = None
                 self.playlist_name_var.set(new_name)
                 self._refresh_playlist_list()
             else:
@@ -211,10 +260,10 @@ class PlaylistView(ttk.Frame):
         if messagebox.askyesno("Delete Playlist", 
                                f"Delete playlist '{self.current_playlist.name}'?"):
             self.playlist_manager.delete_playlist(self.current_playlist.name)
+            self._playlists_cache = None
             self.current_playlist = None
             self.playlist_name_var.set("Select a playlist")
-            self._refresh_playlist_list()
-            self._refresh_track_list()
+            self._schedule_refresh()
     
     def _show_playlist_context_menu(self, event):
         """Show playlist context menu"""
@@ -224,14 +273,29 @@ class PlaylistView(ttk.Frame):
             self.playlist_listbox.selection_clear(0, tk.END)
             self.playlist_listbox.selection_set(idx)
             self._on_playlist_select()
-            self.playlist_context_menu.tk_popup(event.x_root, event.y_root)
+            self.playlist_context_menu.post(event.x_root, event.y_root)
+            self.playlist_context_menu.focus_set()
+            self._playlist_menu_posted = True
+            self._playlist_menu_serial = event.serial
+    
+    def _unpost_playlist_context_menu(self, event=None):
+        """Hide the playlist context menu"""
+        self._playlist_menu_posted = False
+        self.playlist_context_menu.unpost()
+    
+    def _on_window_click(self, event):
+        """Hide the posted playlist menu when the window is clicked elsewhere"""
+        # The click that posted the menu reaches the window binding too
+        if (self._playlist_menu_posted and event.serial != self._playlist_menu_serial
+                and event.widget is not self.playlist_context_menu):
+            self._unpost_playlist_context_menu()
     
     def _show_track_context_menu(self, event):
         """Show track context menu"""
-        item = self.track_tree.identify_row(event.y)
-        if item:
-            if item not in self.track_tree.selection():
-                self.track_tree.selection_set(item)
+        row = self.track_list.identify_row(event.y)
+        if row >= 0:
+            if row not in self.track_list.selection():
+                self.track_list.selection_set(row)
             self.track_context_menu.tk_popup(event.x_root, event.y_root)
     
     def _on_track_double_click(self, event=None):
@@ -239,9 +303,9 @@ class PlaylistView(ttk.Frame):
         if not self.current_playlist:
             return
         
-        selection = self.track_tree.selection()
+        selection = self.track_list.selection()
         if selection:
-            idx = self.track_tree.index(selection[0])
+            idx = selection[0]
             if 0 <= idx < len(self.current_playlist.tracks):
                 track_path = self.current_playlist.tracks[idx]
                 track = self.library.get_track_by_path(track_path)
@@ -257,22 +321,16 @@ class PlaylistView(ttk.Frame):
         if not self.current_playlist:
             return
         
-        selection = self.track_tree.selection()
+        selection = self.track_list.selection()
         if not selection:
             return
         
-        # Get indices in reverse order to avoid index shifting
-        indices = sorted([self.track_tree.index(item) for item in selection], 
-                        reverse=True)
-        
-        for idx in indices:
-            if 0 <= idx < len(self.current_playlist.tracks):
-                track_path = self.current_playlist.tracks[idx]
-                self.current_playlist.remove_track(track_path)
+        # Remove in reverse order to avoid index shifting
+        for idx in reversed(selection):
+            self.current_playlist.remove_at(idx)
         
-        self.playlist_manager.save()
-        self._refresh_track_list()
-        self._refresh_playlist_list()
+        self.playlist_manager.save_async()
+        self._schedule_refresh()
     
     def _play_current_playlist(self):
         """Play all tracks in current playlist"""
@@ -281,20 +339,40 @@ class PlaylistView(ttk.Frame):
     
     def get_playlist_names(self) -> List[str]:
         """Get list of playlist names"""
-        return [p.name for p in self.playlist_manager.get_all_playlists()]
+        return [p.name for p in self._get_playlists()]
     
     def add_track_to_playlist(self, track: Track, playlist_name: str):
         """Add a track to a playlist"""
         if self.playlist_manager.add_track_to_playlist(playlist_name, track.path):
-            if self.current_playlist and self.current_playlist.name == playlist_name:
-                self._refresh_track_list()
-            self._refresh_playlist_list()
+            self._playlists_cache = None
+            is_current = bool(self.current_playlist and
+                              self.current_playlist.name == playlist_name)
+            self._schedule_refresh(tracks=is_current)
+    
+    def _schedule_refresh(self, tracks: bool = True):
+        """Refresh the lists once the current event is done, coalescing repeats"""
+        self._tracks_dirty = self._tracks_dirty or tracks
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after_idle(self._do_refresh)
+    
+    def _do_refresh(self):
+        """Run a scheduled refresh"""
+        self._refresh_pending = False
+        if self._tracks_dirty:
+            self._tracks_dirty = False
+            self._refresh_track_list()
+        self._refresh_playlist_list()
     
     def refresh(self):
         """Public method to refresh the view"""
-        self._refresh_playlist_list()
+        if self.playlist_manager.revision != self._pm_revision:
+            self._refresh_playlist_list()
         if self.current_playlist:
             # Re-fetch the playlist in case it was modified
             self.current_playlist = self.playlist_manager.get_playlist(
                 self.current_playlist.name)
-            self._refresh_track_list()
+            playlist = self.current_playlist
+            if (playlist is None or self._last_rev !=
+                    (playlist, playlist.revision, self.library.version)):
+                self._refresh_track_list()
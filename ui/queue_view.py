@@ -4,10 +4,18 @@ Panel for managing the play queue
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
+from concurrent.futures import Future, ThreadPoolExecutor
+from os.path import basename
 from tkinter import ttk
-from typing import Callable, Optional, List
+from typing import Callable, Optional, List, Dict, Set, Tuple
 from core.queue import PlayQueue
 from core.library import Library, Track
+from ui.virtual_list import VirtualTrackList
+
+
+# Reads tags for queued files that are not in the library
+_resolver_pool = ThreadPoolExecutor(max_workers=2)
 
 
 class QueueView(ttk.Frame):
@@ -21,16 +29,34 @@ class QueueView(ttk.Frame):
         self.library = library
         self.on_track_double_click = on_track_double_click
         
+        # Position the '#' column is numbered from
+        self._current_row = -1
+        # (queue version, current index, library version) of the last full refresh
+        self._fingerprint: Optional[Tuple[int, int, int]] = None
+        self._track_cache: Dict[str, Tuple[str, str]] = {}  # path -> (title, artist)
+        self._cache_version = -1
+        self._resolving: Set[str] = set()  # Paths being read in the background
+        self._dirty = False
+        
+        # Last label texts, so unchanged values don't touch Tk
+        self._last_now_playing = "Nothing playing"
+        self._last_status = ""
+        
         self._create_widgets()
     
     def _create_widgets(self):
         """Create the queue view widgets"""
+        # Fonts are created once and shared by the labels
+        self._font_header = tkfont.Font(family='Segoe UI', size=12, weight='bold')
+        self._font_body = tkfont.Font(family='Segoe UI', size=9)
+        self._font_italic = tkfont.Font(family='Segoe UI', size=9, slant='italic')
+        
         # Header
         header = ttk.Frame(self)
         header.pack(fill=tk.X, padx=5, pady=5)
         
         ttk.Label(header, text="Up Next", 
-                  font=('Segoe UI', 12, 'bold')).pack(side=tk.LEFT)
+                  font=self._font_header).pack(side=tk.LEFT)
         
         clear_btn = ttk.Button(header, text="Clear", command=self._clear_queue)
         clear_btn.pack(side=tk.RIGHT, padx=2)
@@ -40,41 +66,32 @@ class QueueView(ttk.Frame):
         now_playing_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
         
         ttk.Label(now_playing_frame, text="Now Playing:", 
-                  font=('Segoe UI', 9)).pack(side=tk.LEFT)
+                  font=self._font_body).pack(side=tk.LEFT)
         
         self.now_playing_var = tk.StringVar(value="Nothing playing")
         now_playing_label = ttk.Label(now_playing_frame, 
                                       textvariable=self.now_playing_var,
-                                      font=('Segoe UI', 9, 'italic'))
+                                      font=self._font_italic)
         now_playing_label.pack(side=tk.LEFT, padx=(5, 0))
         
         # Queue list
         list_frame = ttk.Frame(self)
         list_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
-        columns = ('index', 'title', 'artist')
-        self.tree = ttk.Treeview(list_frame, columns=columns, show='headings',
-                                  selectmode='extended')
-        
-        self.tree.heading('index', text='#')
-        self.tree.heading('title', text='Title')
-        self.tree.heading('artist', text='Artist')
-        
-        self.tree.column('index', width=30, minwidth=30)
-        self.tree.column('title', width=180, minwidth=100)
-        self.tree.column('artist', width=120, minwidth=80)
-        
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, 
-                                  command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Only the rows in view are drawn, so long queues stay cheap.
+        # Rows hold (title, artist); the '#' column is added at draw time.
+        self.track_list = VirtualTrackList(list_frame, columns=(
+            ('#', 30),
+            ('Title', 180),
+            ('Artist', 120),
+        ), stretch_column=1, row_formatter=self._format_row,
+            highlight_bg='#e3f2fd')
+        self.track_list.pack(fill=tk.BOTH, expand=True)
         
         # Bindings
-        self.tree.bind('<Double-1>', self._on_double_click)
-        self.tree.bind('<Button-3>', self._show_context_menu)
-        self.tree.bind('<Delete>', lambda e: self._remove_selected())
+        self.track_list.bind('<Double-1>', self._on_double_click)
+        self.track_list.bind('<Button-3>', self._show_context_menu)
+        self.track_list.bind('<Delete>', lambda e: self._remove_selected())
         
         # Context menu
         self.context_menu = tk.Menu(self, tearoff=0)
@@ -88,91 +105,184 @@ class QueueView(ttk.Frame):
         # Status bar
         self.status_var = tk.StringVar()
         status_label = ttk.Label(self, textvariable=self.status_var,
-                                 font=('Segoe UI', 9))
+                                 font=self._font_body)
         status_label.pack(fill=tk.X, padx=5, pady=(0, 5))
     
-    def _format_duration(self, seconds: float) -> str:
-        """Format duration in mm:ss"""
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
-        return f"{minutes}:{secs:02d}"
+    def _display_index(self, i: int, current_idx: int) -> str:
+        """Get the '#' column text for row i (relative to current)"""
+        if i == current_idx:
+            return "▶"
+        elif i > current_idx:
+            return str(i - current_idx)
+        return ""
+    
+    def _format_row(self, i: int, row: Tuple[str, str]) -> Tuple[str, str, str]:
+        """Get the drawn values for row i"""
+        return (self._display_index(i, self._current_row),) + row
+    
+    def _check_cache(self):
+        """Drop cached row text if the library changed since it was built"""
+        if self._cache_version != self.library.version:
+            self._track_cache = {}
+            self._cache_version = self.library.version
+    
+    @staticmethod
+    def _text_for(track_path: str, track: Optional[Track]) -> Tuple[str, str]:
+        """Build (title, artist) for a queue entry"""
+        if track:
+            return (track.title, track.artist)
+        return (basename(track_path.replace('\\', '/')), "Unknown")
+    
+    def _row_text(self, track_path: str, track: Optional[Track] = None):
+        """Get (title, artist) for a queue entry"""
+        self._check_cache()
+        text = self._track_cache.get(track_path)
+        if text is None:
+            if track is None:
+                track = self.library.get_track_by_path(track_path)
+            text = self._text_for(track_path, track)
+            self._track_cache[track_path] = text
+        return text
+    
+    def _prefetch_rows(self, paths: List[str]):
+        """Cache row text for all uncached paths with one library lookup"""
+        self._check_cache()
+        cache = self._track_cache
+        missing = [p for p in paths if p not in cache]
+        unknown = []
+        for track_path, track in zip(missing, self.library.get_tracks_by_paths(missing)):
+            cache[track_path] = self._text_for(track_path, track)
+            if track is None and track_path not in self._resolving:
+                unknown.append(track_path)
+        
+        # Files outside the library show their name until their tags are read
+        if unknown:
+            self._resolving.update(unknown)
+            future = _resolver_pool.submit(self.library.read_tracks, unknown)
+            future.add_done_callback(
+                lambda f: self.after(0, self._apply_resolved_tracks, unknown, f))
+    
+    def _apply_resolved_tracks(self, paths: List[str], future: Future):
+        """Show the tags read in the background for files outside the library"""
+        self._resolving.difference_update(paths)
+        try:
+            tracks = future.result()
+        except Exception as e:
+            print(f"Error reading queued tracks: {e}")
+            return
+        
+        if not tracks or self._cache_version != self.library.version:
+            return
+        for track_path, track in tracks.items():
+            self._track_cache[track_path] = self._text_for(track_path, track)
+        self._fingerprint = None
+        self.refresh()
+    
+    def _update_status(self):
+        """Update the status bar"""
+        upcoming = self.queue.upcoming_count()
+        status = f"{upcoming} tracks in queue"
+        if status != self._last_status:
+            self._last_status = status
+            self.status_var.set(status)
+    
+    def _show_now_playing(self, text: str):
+        """Update the now playing label if its text changed"""
+        if text != self._last_now_playing:
+            self._last_now_playing = text
+            self.now_playing_var.set(text)
     
     def refresh(self):
-        """Refresh the queue display"""
-        self.tree.delete(*self.tree.get_children())
+        """Refresh the queue display, at most once per frame (16 ms)"""
+        if not self._dirty:
+            self._dirty = True
+            self.after(16, self._refresh_if_dirty)
+    
+    def _do_refresh(self):
+        """Rebuild the queue display from the queue"""
+        self._dirty = False
+        fingerprint = (self.queue.version, self.queue.get_current_index(),
+                       self.library.version)
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
         
         queue_tracks = self.queue.get_queue()
-        current_idx = self.queue.get_current_index()
-        
-        for i, track_path in enumerate(queue_tracks):
-            track = self.library.get_track_by_path(track_path)
-            
-            # Determine display index (relative to current)
-            if i == current_idx:
-                display_idx = "▶"
-            elif i > current_idx:
-                display_idx = str(i - current_idx)
-            else:
-                display_idx = ""
-            
-            if track:
-                title = track.title
-                artist = track.artist
-            else:
-                title = track_path.split('\\')[-1].split('/')[-1]
-                artist = "Unknown"
-            
-            item = self.tree.insert('', tk.END, values=(display_idx, title, artist))
-            
-            # Highlight current track
-            if i == current_idx:
-                self.tree.item(item, tags=('current',))
-        
-        # Configure tag styling
-        self.tree.tag_configure('current', background='#e3f2fd')
-        
-        # Update status
-        upcoming = len(self.queue.get_upcoming())
-        self.status_var.set(f"{upcoming} tracks in queue")
+        self._current_row = self.queue.get_current_index()
+        self._prefetch_rows(queue_tracks)
+        cache = self._track_cache
+        self.track_list.set_rows([cache[p] for p in queue_tracks], keep_position=True)
+        self.track_list.set_highlight(self._current_row)
+        self._update_status()
         
         # Update now playing
         current = self.queue.get_current()
         if current:
             track = self.library.get_track_by_path(current)
             if track:
-                self.now_playing_var.set(f"{track.title} - {track.artist}")
+                self._show_now_playing(f"{track.title} - {track.artist}")
             else:
-                self.now_playing_var.set(current.split('\\')[-1].split('/')[-1])
+                self._show_now_playing(basename(current.replace('\\', '/')))
         else:
-            self.now_playing_var.set("Nothing playing")
+            self._show_now_playing("Nothing playing")
+    
+    def append_row(self, track: Track):
+        """Append a row for a track just added to the end of the queue"""
+        self._fingerprint = None
+        self.track_list.append_rows([self._row_text(track.path, track)])
+        self._update_status()
+    
+    def remove_rows_from(self, start: int):
+        """Remove all rows from start to the end of the queue"""
+        self._fingerprint = None
+        self.track_list.delete_rows(start)
+        self._update_status()
+    
+    def set_rows(self, tracks: List[Track]):
+        """Replace all rows with the given tracks"""
+        self._fingerprint = None
+        self._current_row = -1
+        self.track_list.set_highlight(-1)
+        self.track_list.set_rows([self._row_text(t.path, t) for t in tracks])
+        self._update_status()
+        if not tracks:
+            self._show_now_playing("Nothing playing")
+    
+    def mark_now_playing(self, current_idx: int):
+        """Move the now playing marker without rebuilding the rows"""
+        self._fingerprint = None
+        if current_idx != self._current_row:
+            # The '#' column is relative to the current track, so redraw it
+            self._current_row = current_idx
+            self.track_list.redraw()
+        self.track_list.set_highlight(current_idx)
+        self._update_status()
     
     def _on_double_click(self, event=None):
         """Handle double-click on track"""
-        selection = self.tree.selection()
+        selection = self.track_list.selection()
         if selection:
-            idx = self.tree.index(selection[0])
-            self.on_track_double_click(idx)
+            self.on_track_double_click(selection[0])
     
     def _show_context_menu(self, event):
         """Show context menu"""
-        item = self.tree.identify_row(event.y)
-        if item:
-            if item not in self.tree.selection():
-                self.tree.selection_set(item)
+        row = self.track_list.identify_row(event.y)
+        if row >= 0:
+            if row not in self.track_list.selection():
+                self.track_list.selection_set(row)
             self.context_menu.tk_popup(event.x_root, event.y_root)
     
     def _play_selected(self):
         """Play selected track"""
-        selection = self.tree.selection()
+        selection = self.track_list.selection()
         if selection:
-            idx = self.tree.index(selection[0])
-            self.on_track_double_click(idx)
+            self.on_track_double_click(selection[0])
     
     def _move_to_next(self):
         """Move selected track to play next"""
-        selection = self.tree.selection()
+        selection = self.track_list.selection()
         if selection:
-            idx = self.tree.index(selection[0])
+            idx = selection[0]
             current_idx = self.queue.get_current_index()
             if idx > current_idx + 1:
                 self.queue.move_track(idx, current_idx + 1)
@@ -180,17 +290,11 @@ class QueueView(ttk.Frame):
     
     def _remove_selected(self):
         """Remove selected tracks from queue"""
-        selection = self.tree.selection()
+        selection = self.track_list.selection()
         if not selection:
             return
         
-        # Get indices in reverse order
-        indices = sorted([self.tree.index(item) for item in selection],
-                        reverse=True)
-        
-        for idx in indices:
-            self.queue.remove(idx)
-        
+        self.queue.remove_many(selection)
         self.refresh()
     
     def _clear_queue(self):
@@ -203,9 +307,14 @@ class QueueView(ttk.Frame):
             self.queue.play_index(0)
         self.refresh()
     
+    def _refresh_if_dirty(self):
+        """Run a scheduled refresh unless one already happened"""
+        if self._dirty:
+            self._do_refresh()
+    
     def set_now_playing(self, track: Optional[Track]):
         """Update the now playing display"""
         if track:
-            self.now_playing_var.set(f"{track.title} - {track.artist}")
+            self._show_now_playing(f"{track.title} - {track.artist}")
         else:
-            self.now_playing_var.set("Nothing playing")
+            self._show_now_playing("Nothing playing")
@@ -8,30 +8,82 @@ tkthemes library (https://github.com/gerp93/KVG_Themes).
 
 # Re-export everything from tkthemes for backward compatibility
 from tkthemes import (
-    apply_theme,
-    get_theme_list,
+    apply_theme as _apply_theme,
+    get_theme_list as _get_theme_list,
     get_theme,
     get_all_themes,
     theme_exists,
-    register_theme,
-    register_custom_theme,
-    unregister_theme,
+    register_theme as _register_theme,
+    register_custom_theme as _register_custom_theme,
+    unregister_theme as _unregister_theme,
 )
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
+
+
+# Bumped whenever the tkthemes registry changes, so cached results go stale
+_registry_generation = 0
+
+
+def _registry_changed():
+    """Invalidate everything cached from the tkthemes registry"""
+    global _registry_generation
+    _registry_generation += 1
+    get_theme_list.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def get_theme_list() -> Tuple[Tuple[str, str], ...]:
+    """Get (theme_id, name) pairs, built once until the registry changes"""
+    return tuple(_get_theme_list())
+
+
+def apply_theme(theme: str, style, root):
+    """Apply a theme, skipping the Tcl round-trips if it is already applied"""
+    applied = (theme, _registry_generation)
+    if getattr(root, '_kvgroove_theme', None) == applied:
+        return getattr(root, '_kvgroove_theme_result', None)
+    result = _apply_theme(theme, style, root)
+    root._kvgroove_theme = applied
+    root._kvgroove_theme_result = result
+    return result
+
+
+def register_theme(*args, **kwargs):
+    """Register a theme with tkthemes"""
+    _registry_changed()
+    return _register_theme(*args, **kwargs)
+
+
+def register_custom_theme(*args, **kwargs):
+    """Register a custom theme with tkthemes"""
+    _registry_changed()
+    return _register_custom_theme(*args, **kwargs)
+
+
+def unregister_theme(*args, **kwargs):
+    """Remove a theme from tkthemes"""
+    _registry_changed()
+    return _unregister_theme(*args, **kwargs)
 
 
 # Backward compatibility: create THEMES dict from tkthemes registry
 def _build_themes_dict() -> Dict[str, Dict[str, str]]:
     """Build THEMES dict from tkthemes for backward compatibility."""
-    themes = {}
-    for theme_id, name in get_theme_list():
-        theme_info = get_theme(theme_id)
-        if theme_info:
-            themes[theme_id] = {
-                "name": theme_info.get("name", name),
-                "icon": theme_info.get("icon", "")
-            }
-    return themes
-
-
-THEMES = _build_themes_dict()
+    return {
+        theme_id: {
+            "name": theme_info.get("name", theme_id),
+            "icon": theme_info.get("icon", "")
+        }
+        for theme_id, theme_info in get_all_themes().items()
+        if theme_info
+    }
+
+
+def __getattr__(name: str):
+    """Build THEMES on first access instead of at import"""
+    if name == "THEMES":
+        global THEMES
+        THEMES = _build_themes_dict()
+        return THEMES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
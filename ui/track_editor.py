@@ -3,40 +3,116 @@ KVGroove Track Editor Dialog
 Edit track metadata (title, artist, album) and optionally save to file
 """
 
+import importlib.util
+import os
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
 from tkinter import ttk, messagebox
+from functools import lru_cache
 from typing import Optional, Callable
-from pathlib import Path
+from pathlib import Path, PurePath
 
 from core.library import Track, Library
 
 
+# Tag writing needs mutagen; it is only imported once a save needs it
+MUTAGEN_AVAILABLE = importlib.util.find_spec('mutagen') is not None
+
+
+@lru_cache(maxsize=1)
+def _load_mutagen():
+    """Import mutagen's File loader on first use"""
+    from mutagen import File
+    return File
+
+
+# Writes tags off the UI thread, one file at a time.
+# Completion is handed back to Tk with after(0, ...), so nothing polls.
+_save_pool = ThreadPoolExecutor(max_workers=1)
+
+# Formats whose tags mutagen can write through its easy interface
+WRITABLE_FORMATS = {'.mp3', '.flac', '.ogg', '.m4a'}
+
+# Slack kept after the tag block so later edits fit without rewriting the file
+MIN_TAG_PADDING = 1024
+
+
+def _tag_padding(info) -> int:
+    """mutagen padding callback: write in place while the tags fit, else leave slack"""
+    if info.padding >= 0:
+        return info.padding
+    return MIN_TAG_PADDING
+
+
 class TrackEditorDialog:
     """Dialog for editing track metadata"""
     
+    # The dialog last built, hidden between uses
+    _instance: Optional['TrackEditorDialog'] = None
+    
     def __init__(self, parent: tk.Tk, track: Track, library: Library,
                  on_save: Optional[Callable[[Track], None]] = None):
         self.track = track
         self.library = library
         self.on_save = on_save
         self.parent = parent
+        self._dirty = False  # Set once any field is edited
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Edit Track")
-        self.dialog.geometry("450x350")
         self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self._close)
         
-        # Center on parent
-        self.dialog.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() - 450) // 2
-        y = parent.winfo_y() + (parent.winfo_height() - 350) // 2
-        self.dialog.geometry(f"450x350+{x}+{y}")
+        self._center()
         
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
         self._create_widgets()
     
+    @classmethod
+    def show(cls, parent: tk.Tk, track: Track, library: Library,
+             on_save: Optional[Callable[[Track], None]] = None) -> 'TrackEditorDialog':
+        """Edit a track, reusing the hidden dialog from the last edit when possible"""
+        editor = cls._instance
+        if (editor is None or editor.parent is not parent or editor.library is not library
+                or not editor.dialog.winfo_exists()):
+            editor = cls._instance = cls(parent, track, library, on_save)
+            return editor
+        
+        editor._load(track, on_save)
+        return editor
+    
+    def _load(self, track: Track, on_save: Optional[Callable[[Track], None]]):
+        """Fill the existing widgets with another track and show the dialog again"""
+        self.track = track
+        self.on_save = on_save
+        
+        self.path_label.config(text=self._truncate_path(track.path))
+        self.title_var.set(track.title)
+        self.artist_var.set(track.artist)
+        self.album_var.set(track.album)
+        self.save_to_file_var.set(MUTAGEN_AVAILABLE)
+        self._dirty = False  # Filling the fields is not an edit
+        
+        self._center()
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.dialog.focus_set()
+    
+    def _center(self):
+        """Size and center the dialog on its parent in one geometry call"""
+        # Only the parent's geometry is needed, so there is no idle flush first
+        parent = self.parent
+        x = parent.winfo_x() + (parent.winfo_width() - 450) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - 350) // 2
+        self.dialog.geometry(f"450x350+{x}+{y}")
+    
+    def _close(self):
+        """Hide the dialog so the next edit can reuse it"""
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+    
     def _create_widgets(self):
         """Create dialog widgets"""
         main_frame = ttk.Frame(self.dialog, padding=20)
@@ -47,43 +123,37 @@ class TrackEditorDialog:
                                 font=('Segoe UI', 14, 'bold'))
         title_label.pack(pady=(0, 15))
         
+        # Fields share one grid so the labels line up in a single layout pass
+        form = ttk.Frame(main_frame)
+        form.pack(fill=tk.X)
+        form.grid_columnconfigure(1, weight=1)
+        
         # File path (read-only)
-        path_frame = ttk.Frame(main_frame)
-        path_frame.pack(fill=tk.X, pady=(0, 10))
-        ttk.Label(path_frame, text="File:", width=8).pack(side=tk.LEFT)
-        path_label = ttk.Label(path_frame, text=self._truncate_path(self.track.path),
-                               font=('Segoe UI', 9), foreground='gray')
-        path_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # Title field
-        title_frame = ttk.Frame(main_frame)
-        title_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(title_frame, text="Title:", width=8).pack(side=tk.LEFT)
-        self.title_var = tk.StringVar(value=self.track.title)
-        ttk.Entry(title_frame, textvariable=self.title_var, 
-                  font=('Segoe UI', 10)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Label(form, text="File:", width=8).grid(row=0, column=0, sticky='w',
+                                                    pady=(0, 10))
+        self.path_label = ttk.Label(form, text=self._truncate_path(self.track.path),
+                                    font=('Segoe UI', 9), foreground='gray')
+        self.path_label.grid(row=0, column=1, sticky='ew', pady=(0, 10))
         
-        # Artist field
-        artist_frame = ttk.Frame(main_frame)
-        artist_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(artist_frame, text="Artist:", width=8).pack(side=tk.LEFT)
+        # Title, artist and album fields
+        self.title_var = tk.StringVar(value=self.track.title)
         self.artist_var = tk.StringVar(value=self.track.artist)
-        ttk.Entry(artist_frame, textvariable=self.artist_var,
-                  font=('Segoe UI', 10)).pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        # Album field
-        album_frame = ttk.Frame(main_frame)
-        album_frame.pack(fill=tk.X, pady=5)
-        ttk.Label(album_frame, text="Album:", width=8).pack(side=tk.LEFT)
         self.album_var = tk.StringVar(value=self.track.album)
-        ttk.Entry(album_frame, textvariable=self.album_var,
-                  font=('Segoe UI', 10)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        fields = (("Title:", self.title_var),
+                  ("Artist:", self.artist_var),
+                  ("Album:", self.album_var))
+        for row, (label, var) in enumerate(fields, start=1):
+            ttk.Label(form, text=label, width=8).grid(row=row, column=0, sticky='w', pady=5)
+            ttk.Entry(form, textvariable=var,
+                      font=('Segoe UI', 10)).grid(row=row, column=1, sticky='ew', pady=5)
+            var.trace_add('write', self._mark_dirty)
         
         # Save to file checkbox
-        self.save_to_file_var = tk.BooleanVar(value=True)
+        self.save_to_file_var = tk.BooleanVar(value=MUTAGEN_AVAILABLE)
         save_check = ttk.Checkbutton(main_frame, 
                                      text="Also save changes to the audio file metadata",
-                                     variable=self.save_to_file_var)
+                                     variable=self.save_to_file_var,
+                                     state=tk.NORMAL if MUTAGEN_AVAILABLE else tk.DISABLED)
         save_check.pack(anchor=tk.W, pady=(15, 5))
         
         # Note about file metadata
@@ -96,22 +166,46 @@ class TrackEditorDialog:
         btn_frame = tk.Frame(main_frame)
         btn_frame.pack(fill=tk.X, pady=(25, 10))
         
-        save_btn = tk.Button(btn_frame, text="Save", width=12, font=('Segoe UI', 9),
-                             command=self._on_save)
-        save_btn.pack(side=tk.RIGHT, padx=(5, 0), ipady=3)
+        self.save_btn = tk.Button(btn_frame, text="Save", width=12, font=('Segoe UI', 9),
+                                  command=self._on_save)
+        self.save_btn.pack(side=tk.RIGHT, padx=(5, 0), ipady=3)
+        
+        self.cancel_btn = tk.Button(btn_frame, text="Cancel", width=12, font=('Segoe UI', 9),
+                                    command=self._close)
+        self.cancel_btn.pack(side=tk.RIGHT, ipady=3)
         
-        cancel_btn = tk.Button(btn_frame, text="Cancel", width=12, font=('Segoe UI', 9),
-                               command=self.dialog.destroy)
-        cancel_btn.pack(side=tk.RIGHT, ipady=3)
+        # Shown while the audio file is being written
+        self.progress = ttk.Progressbar(btn_frame, mode='indeterminate', length=120)
     
-    def _truncate_path(self, path: str, max_len: int = 50) -> str:
-        """Truncate path for display"""
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _truncate_path(path: str, max_len: int = 50) -> str:
+        """Truncate path for display, dropping whole leading folders"""
         if len(path) <= max_len:
             return path
-        return "..." + path[-(max_len - 3):]
+        if max_len <= 3:
+            return "..."[:max_len]
+        
+        parts = PurePath(path).parts
+        while len(parts) > 1 and len(os.sep.join(parts)) > max_len - 4:
+            parts = parts[1:]
+        tail = os.sep.join(parts)
+        if len(tail) > max_len - 4:
+            # A single name is still too long, so cut inside it
+            return "..." + tail[-(max_len - 3):]
+        return "..." + os.sep + tail
+    
+    def _mark_dirty(self, *args):
+        """Note that a field was edited"""
+        self._dirty = True
     
     def _on_save(self):
         """Save changes"""
+        # Nothing was typed, so there is nothing to compare or save
+        if not self._dirty:
+            self._close()
+            return
+        
         new_title = self.title_var.get().strip()
         new_artist = self.artist_var.get().strip()
         new_album = self.album_var.get().strip()
@@ -128,19 +222,48 @@ class TrackEditorDialog:
                    new_album != self.track.album)
         
         if not changed:
-            self.dialog.destroy()
+            self._close()
             return
         
-        # Save to file if requested
+        # Save to file if requested, off the UI thread
         if self.save_to_file_var.get():
-            success = self._save_to_file(new_title, new_artist, new_album)
-            if not success:
-                if not messagebox.askyesno("File Update Failed",
-                                           "Could not update the audio file metadata.\n"
-                                           "Save changes to library only?",
-                                           parent=self.dialog):
-                    return
+            self._set_saving(True)
+            future = _save_pool.submit(self._save_to_file, new_title, new_artist, new_album)
+            future.add_done_callback(
+                lambda f: self.dialog.after(0, self._on_file_saved, f,
+                                            new_title, new_artist, new_album))
+            return
+        
+        self._finish_save(new_title, new_artist, new_album)
+    
+    def _set_saving(self, saving: bool):
+        """Lock the dialog while the file is being written"""
+        state = tk.DISABLED if saving else tk.NORMAL
+        self.save_btn.config(state=state)
+        self.cancel_btn.config(state=state)
+        if saving:
+            self.dialog.protocol("WM_DELETE_WINDOW", lambda: None)
+            self.progress.pack(side=tk.LEFT)
+            self.progress.start(10)
+        else:
+            self.dialog.protocol("WM_DELETE_WINDOW", self._close)
+            self.progress.stop()
+            self.progress.pack_forget()
+    
+    def _on_file_saved(self, future: Future, title: str, artist: str, album: str):
+        """Finish the save once the file write is done"""
+        self._set_saving(False)
+        if not future.result():
+            if not messagebox.askyesno("File Update Failed",
+                                       "Could not update the audio file metadata.\n"
+                                       "Save changes to library only?",
+                                       parent=self.dialog):
+                return
         
+        self._finish_save(title, artist, album)
+    
+    def _finish_save(self, new_title: str, new_artist: str, new_album: str):
+        """Apply the changes to the library and close"""
         # Update track object
         self.track.title = new_title
         self.track.artist = new_artist
@@ -155,56 +278,26 @@ class TrackEditorDialog:
         
         messagebox.showinfo("Saved", "Track metadata updated successfully!",
                            parent=self.dialog)
-        self.dialog.destroy()
+        self._close()
     
     def _save_to_file(self, title: str, artist: str, album: str) -> bool:
         """Save metadata to the actual audio file"""
+        if Path(self.track.path).suffix.lower() not in WRITABLE_FORMATS:
+            # Unsupported format for writing
+            return False
+        
         try:
-            from mutagen import File
-            from mutagen.easyid3 import EasyID3
-            from mutagen.mp3 import MP3
-            from mutagen.flac import FLAC
-            from mutagen.id3 import ID3, TIT2, TPE1, TALB
-            
-            path = Path(self.track.path)
-            suffix = path.suffix.lower()
-            
-            if suffix == '.mp3':
-                try:
-                    audio = EasyID3(self.track.path)
-                except Exception:
-                    # No ID3 tag, create one
-                    audio = MP3(self.track.path)
-                    audio.add_tags()
-                    audio.save()
-                    audio = EasyID3(self.track.path)
-                
-                audio['title'] = title
-                audio['artist'] = artist
-                audio['album'] = album
-                audio.save()
-                
-            elif suffix == '.flac':
-                audio = FLAC(self.track.path)
-                audio['title'] = title
-                audio['artist'] = artist
-                audio['album'] = album
-                audio.save()
-                
-            elif suffix in ('.ogg', '.m4a'):
-                audio = File(self.track.path)
-                if audio is not None and audio.tags is not None:
-                    # Try common tag names
-                    audio.tags['title'] = title
-                    audio.tags['artist'] = artist
-                    audio.tags['album'] = album
-                    audio.save()
-                else:
-                    return False
-            else:
-                # Unsupported format for writing
+            # easy=True maps title/artist/album onto each format's own tag names
+            audio = _load_mutagen()(self.track.path, easy=True)
+            if audio is None:
                 return False
+            if audio.tags is None:
+                audio.add_tags()
             
+            audio['title'] = [title]
+            audio['artist'] = [artist]
+            audio['album'] = [album]
+            audio.save(padding=_tag_padding)
             return True
             
         except Exception as e:
@@ -213,8 +306,4 @@ class TrackEditorDialog:
     
     def _update_library(self):
         """Update the track in the library"""
-        for i, t in enumerate(self.library.tracks):
-            if t.path == self.track.path:
-                self.library.tracks[i] = self.track
-                break
-        self.library._save()
+        self.library.update_track(self.track)
@@ -0,0 +1,441 @@
+"""
+KVGroove Virtual List
+Canvas-backed list that only draws the rows in view
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+
+class VirtualListbox(tk.Canvas):
+    """Single-selection Listbox replacement for very long lists
+    
+    Items are kept in Python and only the visible rows are drawn, so
+    scrolling and redrawing cost the same no matter how many items there
+    are. Supports the subset of the tk.Listbox API used by the views.
+    """
+    
+    ROW_HEIGHT = 20
+    
+    def __init__(self, parent, font=('Segoe UI', 10), **kwargs):
+        super().__init__(parent, highlightthickness=0,
+                         yscrollincrement=self.ROW_HEIGHT, **kwargs)
+        self._items: List[str] = []
+        self._selected: Optional[int] = None
+        self._font = font
+        self._user_yscrollcommand = None
+        
+        super().configure(yscrollcommand=self._on_yscroll)
+        self._load_colors()
+        
+        self.bind('<<ThemeChanged>>', self._on_theme_changed)
+        self.bind('<Button-1>', self._on_click)
+        self.bind('<MouseWheel>', self._on_mousewheel)
+        self.bind('<Button-4>', lambda e: self.yview_scroll(-3, 'units'))
+        self.bind('<Button-5>', lambda e: self.yview_scroll(3, 'units'))
+    
+    def _load_colors(self):
+        """Pick up colors from the current ttk theme's Treeview style"""
+        style = ttk.Style(self)
+        self._fg = style.lookup('Treeview', 'foreground') or 'black'
+        self._select_bg = style.lookup('Treeview', 'background', ('selected',)) or '#0078d7'
+        self._select_fg = style.lookup('Treeview', 'foreground', ('selected',)) or 'white'
+        super().configure(background=style.lookup('Treeview', 'background') or 'white')
+    
+    def _on_theme_changed(self, event=None):
+        """Recolor for the new theme"""
+        self._load_colors()
+        self._paint()
+    
+    def configure(self, cnf=None, **kw):
+        """Configure the widget, keeping our own yscrollcommand hook"""
+        if 'yscrollcommand' in kw:
+            self._user_yscrollcommand = kw.pop('yscrollcommand')
+        return super().configure(cnf, **kw)
+    
+    config = configure
+    
+    def _index(self, index) -> int:
+        """Convert a Listbox index (int or END) to an int"""
+        if index == tk.END:
+            return len(self._items)
+        return int(index)
+    
+    def insert(self, index, *elements):
+        """Insert items before index"""
+        i = self._index(index)
+        self._items[i:i] = elements
+        if self._selected is not None and self._selected >= i:
+            self._selected += len(elements)
+        self._update_scrollregion()
+    
+    def delete(self, first, last=None):
+        """Delete items first through last (inclusive)"""
+        first = self._index(first)
+        last = first if last is None else min(self._index(last), len(self._items) - 1)
+        del self._items[first:last + 1]
+        if self._selected is not None:
+            if first <= self._selected <= last:
+                self._selected = None
+            elif self._selected > last:
+                self._selected -= last - first + 1
+        self._update_scrollregion()
+    
+    def size(self) -> int:
+        """Get the number of items"""
+        return len(self._items)
+    
+    def curselection(self) -> Tuple[int, ...]:
+        """Get the selected index, as a tuple like Listbox"""
+        return () if self._selected is None else (self._selected,)
+    
+    def selection_set(self, first, last=None):
+        """Select an item"""
+        i = self._index(first)
+        if 0 <= i < len(self._items):
+            self._selected = i
+            self._paint()
+    
+    def selection_clear(self, first, last=None):
+        """Clear the selection"""
+        self._selected = None
+        self._paint()
+    
+    def nearest(self, y: int) -> int:
+        """Get the index of the item nearest to a widget y coordinate"""
+        if not self._items:
+            return -1
+        row = int(self.canvasy(y) // self.ROW_HEIGHT)
+        return max(0, min(row, len(self._items) - 1))
+    
+    def _update_scrollregion(self):
+        """Size the scroll region to the item count and redraw"""
+        super().configure(scrollregion=(0, 0, 0, len(self._items) * self.ROW_HEIGHT))
+        self._paint()
+    
+    def _on_yscroll(self, first, last):
+        """Redraw for the new view and forward to the scrollbar"""
+        self._paint()
+        if self._user_yscrollcommand:
+            self._user_yscrollcommand(first, last)
+    
+    def _on_click(self, event):
+        """Select the clicked item"""
+        i = self.nearest(event.y)
+        if i >= 0 and i != self._selected:
+            self.selection_set(i)
+            self.event_generate('<<ListboxSelect>>')
+    
+    def _on_mousewheel(self, event):
+        """Scroll with the mouse wheel"""
+        self.yview_scroll(int(-event.delta / 120) * 3, 'units')
+    
+    def _paint(self):
+        """Draw only the rows currently in view"""
+        self._clear_canvas()
+        row_h = self.ROW_HEIGHT
+        top = self.canvasy(0)
+        first = max(0, int(top // row_h))
+        last = min(len(self._items), int((top + self.winfo_height()) // row_h) + 1)
+        width = self.winfo_width()
+        
+        for i in range(first, last):
+            y = i * row_h
+            fg = self._fg
+            if i == self._selected:
+                self.create_rectangle(0, y, width, y + row_h,
+                                      fill=self._select_bg, width=0)
+                fg = self._select_fg
+            self.create_text(4, y + row_h // 2, text=self._items[i], anchor=tk.W,
+                             font=self._font, fill=fg)
+    
+    def _clear_canvas(self):
+        """Remove all drawn canvas items"""
+        super().delete('all')
+
+
+class VirtualTrackList(ttk.Frame):
+    """Multi-column track list that only draws the rows in view
+    
+    Rows are plain tuples kept in Python, so a playlist of any length
+    costs one set of canvas items per visible row instead of one
+    Treeview item per track. Selection is by row index and supports
+    click, Ctrl+click and Shift+click like an extended Treeview.
+    """
+    
+    ROW_HEIGHT = 22
+    
+    def __init__(self, parent, columns: Sequence[Tuple[str, int]],
+                 font=('Segoe UI', 10), stretch_column: int = 0,
+                 row_formatter: Optional[Callable[[int, tuple], tuple]] = None,
+                 highlight_bg: str = '#e3f2fd'):
+        """columns: (heading, width) pairs; stretch_column takes any spare width.
+        row_formatter, if given, turns (index, row) into the values drawn."""
+        super().__init__(parent)
+        self._columns = list(columns)
+        self._stretch_column = stretch_column
+        self._row_formatter = row_formatter
+        self._font = font
+        self._rows: List[tuple] = []
+        self._top = 0  # Index of the first visible row
+        self._selection: Set[int] = set()
+        self._anchor = 0  # Row Shift+click extends from
+        self._highlight = -1  # Row drawn with highlight_bg, e.g. now playing
+        self._highlight_bg = highlight_bg
+        self._paint_pending = False
+        self._painted = None  # (script, texts, view) of the last paint
+        
+        # Tcl variables the batched paint script reads row text and the font from
+        self._text_var = f'kvgroove_rows{id(self)}'
+        self._font_var = f'kvgroove_font{id(self)}'
+        self.tk.call('set', self._font_var, font)
+        
+        self._header = tk.Canvas(self, height=self.ROW_HEIGHT, highlightthickness=0)
+        self.canvas = tk.Canvas(self, highlightthickness=0, takefocus=True)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        
+        self._header.grid(row=0, column=0, sticky='ew')
+        self.canvas.grid(row=1, column=0, sticky='nsew')
+        self.scrollbar.grid(row=0, column=1, rowspan=2, sticky='ns')
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+        
+        self._load_colors()
+        
+        self._header.bind('<Configure>', lambda e: self._paint_header())
+        self.canvas.bind('<Configure>', lambda e: self._scroll_to(self._top))
+        self.canvas.bind('<Button-1>', self._on_click)
+        self.canvas.bind('<Control-Button-1>', self._on_ctrl_click)
+        self.canvas.bind('<Shift-Button-1>', self._on_shift_click)
+        self.canvas.bind('<Up>', lambda e: self._move_selection(-1))
+        self.canvas.bind('<Down>', lambda e: self._move_selection(1))
+        self.canvas.bind('<MouseWheel>', self._on_mousewheel)
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -3, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 3, 'units'))
+        self.bind('<<ThemeChanged>>', self._on_theme_changed)
+    
+    def _load_colors(self):
+        """Pick up colors from the current ttk theme's Treeview style"""
+        style = ttk.Style(self)
+        self._bg = style.lookup('Treeview', 'background') or 'white'
+        self._fg = style.lookup('Treeview', 'foreground') or 'black'
+        self._select_bg = style.lookup('Treeview', 'background', ('selected',)) or '#0078d7'
+        self._select_fg = style.lookup('Treeview', 'foreground', ('selected',)) or 'white'
+        self._heading_bg = style.lookup('Treeview.Heading', 'background') or '#f0f0f0'
+        self._heading_fg = style.lookup('Treeview.Heading', 'foreground') or 'black'
+        self.canvas.configure(background=self._bg)
+        self._header.configure(background=self._heading_bg)
+    
+    def _on_theme_changed(self, event=None):
+        """Recolor after a theme switch"""
+        self._load_colors()
+        self._paint_header()
+        self.redraw()
+    
+    def bind(self, sequence=None, func=None, add=None):
+        """Bind on the row canvas, where mouse and key events arrive"""
+        if sequence == '<<ThemeChanged>>':
+            return super().bind(sequence, func, add)
+        return self.canvas.bind(sequence, func, add)
+    
+    def set_rows(self, rows: List[tuple], keep_position: bool = False):
+        """Replace all rows, clearing the selection"""
+        if keep_position and rows == self._rows:
+            # Nothing changed, so keep the selection as well
+            return
+        self._rows = rows
+        self._selection = set()
+        self._anchor = 0
+        self._scroll_to(self._top if keep_position else 0)
+    
+    def append_rows(self, rows: List[tuple]):
+        """Add rows at the end"""
+        self._rows.extend(rows)
+        self.redraw()
+    
+    def delete_rows(self, start: int, end: Optional[int] = None):
+        """Delete rows start to end (exclusive, default the last row), keeping the selection"""
+        end = len(self._rows) if end is None else min(end, len(self._rows))
+        if start >= end:
+            return
+        del self._rows[start:end]
+        removed = end - start
+        self._selection = {i if i < start else i - removed
+                           for i in self._selection if not start <= i < end}
+        self._scroll_to(self._top)
+    
+    def set_highlight(self, index: int):
+        """Highlight one row (-1 for none)"""
+        if index != self._highlight:
+            self._highlight = index
+            self.redraw()
+    
+    def selection(self) -> List[int]:
+        """Get the selected row indices, in order"""
+        return sorted(self._selection)
+    
+    def selection_set(self, index: int):
+        """Select a single row"""
+        self._selection = {index}
+        self._anchor = index
+        self.redraw()
+    
+    def identify_row(self, y: int) -> int:
+        """Get the row index at a canvas y coordinate, or -1"""
+        index = self._top + y // self.ROW_HEIGHT
+        return index if 0 <= index < len(self._rows) else -1
+    
+    def _visible_count(self) -> int:
+        """Get the number of rows that fit in the canvas"""
+        return max(1, self.canvas.winfo_height() // self.ROW_HEIGHT)
+    
+    def yview(self, *args):
+        """Scroll like a Tk widget; used as the scrollbar command"""
+        if args[0] == tk.MOVETO:
+            self._scroll_to(int(float(args[1]) * len(self._rows)))
+        elif args[0] == tk.SCROLL:
+            amount = int(args[1])
+            if args[2] == tk.PAGES:
+                amount *= self._visible_count()
+            self._scroll_to(self._top + amount)
+    
+    def _scroll_to(self, top: int):
+        """Make row top the first visible row and redraw"""
+        self._top = max(0, min(top, len(self._rows) - self._visible_count()))
+        self.redraw()
+    
+    def _see(self, index: int):
+        """Scroll just enough to make a row visible"""
+        if index < self._top:
+            self._scroll_to(index)
+        elif index >= self._top + self._visible_count():
+            self._scroll_to(index - self._visible_count() + 1)
+        else:
+            self.redraw()
+    
+    def _on_mousewheel(self, event):
+        """Scroll with the mouse wheel"""
+        self.yview(tk.SCROLL, int(-event.delta / 120) * 3, tk.UNITS)
+    
+    def _on_click(self, event):
+        """Select the clicked row"""
+        self.canvas.focus_set()
+        index = self.identify_row(event.y)
+        if index >= 0:
+            self.selection_set(index)
+    
+    def _on_ctrl_click(self, event):
+        """Toggle the clicked row in the selection"""
+        self.canvas.focus_set()
+        index = self.identify_row(event.y)
+        if index >= 0:
+            self._selection ^= {index}
+            self._anchor = index
+            self.redraw()
+    
+    def _on_shift_click(self, event):
+        """Select the rows from the anchor to the clicked row"""
+        self.canvas.focus_set()
+        index = self.identify_row(event.y)
+        if index >= 0:
+            low, high = sorted((self._anchor, index))
+            self._selection = set(range(low, high + 1))
+            self.redraw()
+    
+    def _move_selection(self, step: int):
+        """Move a single selection up or down with the arrow keys"""
+        if not self._rows:
+            return
+        if self._selection:
+            current = max(self._selection) if step > 0 else min(self._selection)
+            index = current + step
+        else:
+            index = self._top
+        index = max(0, min(index, len(self._rows) - 1))
+        self._selection = {index}
+        self._anchor = index
+        self._see(index)
+    
+    def _column_layout(self, total: int) -> List[Tuple[int, int]]:
+        """Get (x, width) for each column; the stretch column takes the spare width"""
+        widths = [width for _, width in self._columns]
+        stretch = self._stretch_column
+        widths[stretch] = max(widths[stretch], total - sum(widths) + widths[stretch])
+        layout = []
+        x = 0
+        for width in widths:
+            layout.append((x, width))
+            x += width
+        return layout
+    
+    def _paint_header(self):
+        """Draw the column headings"""
+        header = self._header
+        header.delete('all')
+        row_h = self.ROW_HEIGHT
+        layout = self._column_layout(header.winfo_width())
+        for (heading, _), (x, width) in zip(self._columns, layout):
+            header.create_text(x + 4, row_h // 2, text=heading, anchor=tk.W,
+                               font=self._font, fill=self._heading_fg)
+            header.create_line(x + width - 1, 2, x + width - 1, row_h - 2,
+                               fill=self._heading_fg)
+    
+    def redraw(self):
+        """Repaint once the current event is done, coalescing repeats"""
+        if not self._paint_pending:
+            self._paint_pending = True
+            self.after_idle(self._paint)
+    
+    def _paint(self):
+        """Draw only the rows currently in view and update the scrollbar"""
+        self._paint_pending = False
+        canvas = str(self.canvas)
+        row_h = self.ROW_HEIGHT
+        count = len(self._rows)
+        first = self._top
+        last = min(count, first + self._visible_count() + 1)
+        layout = self._column_layout(self.canvas.winfo_width())
+        row_formatter = self._row_formatter
+        
+        # Build one Tcl script for the whole view instead of one call per item.
+        # Row text is passed as a Tcl list variable, so it never needs quoting.
+        texts = []
+        script = [f'{canvas} delete all']
+        for i in range(first, last):
+            y = (i - first) * row_h
+            selected = i in self._selection
+            if selected:
+                bg, fg = self._select_bg, self._select_fg
+            elif i == self._highlight:
+                bg, fg = self._highlight_bg, self._fg
+            else:
+                bg, fg = self._bg, self._fg
+            if bg != self._bg:
+                script.append(f'{canvas} create rectangle 0 {y} {layout[0][1]} {y + row_h} '
+                              f'-fill {{{bg}}} -width 0')
+            row = self._rows[i]
+            if row_formatter:
+                row = row_formatter(i, row)
+            for col, (value, (x, width)) in enumerate(zip(row, layout)):
+                if col:
+                    # Cover the overflow of the column to the left
+                    script.append(f'{canvas} create rectangle {x} {y} {x + width} {y + row_h} '
+                                  f'-fill {{{bg}}} -width 0')
+                script.append(f'{canvas} create text {x + 4} {y + row_h // 2} '
+                              f'-text [lindex ${self._text_var} {len(texts)}] '
+                              f'-anchor w -font ${self._font_var} -fill {{{fg}}}')
+                texts.append(value)
+        if count:
+            view = (first / count, min(1.0, (first + self._visible_count()) / count))
+        else:
+            view = (0.0, 1.0)
+        
+        # Leave Tk alone when the view would come out the same as last time
+        painted = (script, texts, view)
+        if painted == self._painted:
+            return
+        self._painted = painted
+        self.tk.call('set', self._text_var, texts)
+        self.tk.eval('\n'.join(script))
+        self.scrollbar.set(*view)